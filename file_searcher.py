@@ -1,9 +1,22 @@
+import argparse
 import json
 import os
 import re
 import queue
+import shutil
+import signal
+import socket
+import socketserver
+import stat
+import struct
+import sys
+import tempfile
 import threading
 import datetime
+import heapq
+import tarfile
+import time
+import zipfile
 from pathlib import Path
 from tkinter import (
     Tk, StringVar, BooleanVar, Frame, Label, Entry, Button,
@@ -11,6 +24,13 @@ from tkinter import (
 )
 from tkinter import ttk
 
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_constants
+
 try:
     import windnd
     HAS_WINDND = True
@@ -68,12 +88,1113 @@ DARK_THEME = {
 HISTORY_FILE = os.path.join(os.path.dirname(__file__), ".search_history.json")
 MAX_HISTORY = 20
 
+PSEUDO_FS_TYPES = {
+    "proc", "sysfs", "devtmpfs", "devpts", "cgroup", "cgroup2",
+    "securityfs", "debugfs", "tracefs", "pstore", "bpf", "configfs",
+    "fusectl", "mqueue", "hugetlbfs", "binfmt_misc", "efivarfs",
+    "selinuxfs", "rpc_pipefs", "nsfs", "autofs",
+}
+PSEUDO_FS_PATHS = ("/proc", "/sys", "/dev")
+MOUNTS_FILE = "/proc/self/mounts"
+
+def _pseudo_devices() -> set[int]:
+    # compared by st_dev so symlinks into /proc etc. are caught as well
+    points = {p for p in PSEUDO_FS_PATHS if os.path.ismount(p)}
+    try:
+        with open(MOUNTS_FILE, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 3 or parts[2] not in PSEUDO_FS_TYPES:
+                    continue
+                mount = re.sub(
+                    r"\\([0-7]{3})", lambda m: chr(int(m.group(1), 8)), parts[1]
+                )
+                points.add(os.path.normpath(mount))
+    except OSError:
+        pass
+    devices = set()
+    for point in points:
+        try:
+            devices.add(os.stat(point).st_dev)
+        except OSError:
+            continue
+    return devices
+
+REGEX_SLOW_MATCH_SEC = 0.05
+REGEX_MATCH_LIMIT_SEC = 1.0
+REGEX_AVG_LIMIT_SEC = 0.001
+REGEX_AVG_MIN_NAMES = 1000
+MAX_LITERAL_ALTERNATIVES = 32
+# the only non-ASCII characters that re.IGNORECASE matches against ASCII letters
+FOLDS_TO_ASCII = frozenset("\u0130\u0131\u017f\u212a")
+ASCII_LOWER = str.maketrans(
+    "ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz",
+)
+
+def _literal_alternatives(items) -> set[str] | None:
+    alts = {""}
+    for op, av in items:
+        if op is sre_constants.LITERAL:
+            choices = {chr(av)}
+        elif op is sre_constants.IN:
+            if not all(o is sre_constants.LITERAL for o, _ in av):
+                return None
+            choices = {chr(v) for _, v in av}
+        elif op is sre_constants.SUBPATTERN:
+            choices = _literal_alternatives(av[-1])
+        elif op is sre_constants.BRANCH:
+            choices = set()
+            for branch in av[1]:
+                sub = _literal_alternatives(branch)
+                if sub is None:
+                    return None
+                choices |= sub
+        else:
+            return None
+        if choices is None:
+            return None
+        alts = {a + c for a in alts for c in choices}
+        if len(alts) > MAX_LITERAL_ALTERNATIVES:
+            return None
+    return alts
+
+def _literal_run(items, from_end: bool = False) -> tuple[str, ...] | None:
+    alts = {""}
+    for item in (reversed(items) if from_end else items):
+        choices = _fold_literals(_literal_alternatives([item]))
+        if choices is None:
+            break
+        if from_end:
+            grown = {c + a for a in alts for c in choices}
+        else:
+            grown = {a + c for a in alts for c in choices}
+        if len(grown) > MAX_LITERAL_ALTERNATIVES:
+            break
+        alts = grown
+    return _fold_literals(alts)
+
+def _fold_literals(alts: set[str] | None) -> tuple[str, ...] | None:
+    # ASCII letters compare lowercased; anything else must be caseless
+    # (kana, kanji, digits, ...) so it can only ever match itself
+    if not alts or "" in alts:
+        return None
+    for alt in alts:
+        if not all(c.isascii() or c.lower() == c.upper() == c for c in alt):
+            return None
+    return tuple(sorted({a.translate(ASCII_LOWER) for a in alts}))
+
+def _has_nested_repeat(items, inside: bool = False) -> bool:
+    for op, av in items:
+        if op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            unbounded = av[1] == sre_constants.MAXREPEAT
+            if unbounded and inside:
+                return True
+            if _has_nested_repeat(av[2], inside or unbounded):
+                return True
+        elif op is sre_constants.SUBPATTERN:
+            if _has_nested_repeat(av[-1], inside):
+                return True
+        elif op is sre_constants.BRANCH:
+            if any(_has_nested_repeat(b, inside) for b in av[1]):
+                return True
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            if _has_nested_repeat(av[1], inside):
+                return True
+    return False
+
+def _has_scoped_flags(items) -> bool:
+    for op, av in items:
+        if op is sre_constants.SUBPATTERN:
+            if av[1] or av[2] or _has_scoped_flags(av[-1]):
+                return True
+        elif op is sre_constants.BRANCH:
+            if any(_has_scoped_flags(b) for b in av[1]):
+                return True
+        elif op in (sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT):
+            if _has_scoped_flags(av[2]):
+                return True
+        elif op in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+            if _has_scoped_flags(av[1]):
+                return True
+    return False
+
+def _analyze_regex(keyword: str) -> dict:
+    info = {
+        "anchored": False, "exact": None, "prefixes": None,
+        "suffixes": None, "literals": (), "nested_repeat": False,
+    }
+    try:
+        parsed = sre_parse.parse(keyword, re.IGNORECASE)
+        items = list(parsed)
+        info["nested_repeat"] = _has_nested_repeat(items)
+
+        starts = (sre_constants.AT_BEGINNING, sre_constants.AT_BEGINNING_STRING)
+        ends = (sre_constants.AT_END, sre_constants.AT_END_STRING)
+        multiline = parsed.state.flags & re.MULTILINE
+        at_start = (not multiline and bool(items)
+                    and items[0][0] is sre_constants.AT and items[0][1] in starts)
+        at_end = (not multiline and bool(items)
+                  and items[-1][0] is sre_constants.AT and items[-1][1] in ends)
+        body = items[1 if at_start else 0:len(items) - 1 if at_end else len(items)]
+
+        info["anchored"] = at_start
+        if at_start and at_end and not _has_scoped_flags(items):
+            info["exact"] = _fold_literals(_literal_alternatives(body))
+        if at_start:
+            info["prefixes"] = _literal_run(body)
+        if at_end:
+            info["suffixes"] = _literal_run(body, from_end=True)
+
+        literals = []
+        run = ""
+        for item in items:
+            choices = _fold_literals(_literal_alternatives([item]))
+            if choices is not None and len(choices) == 1:
+                run += choices[0]
+                continue
+            if run:
+                literals.append(run)
+            run = ""
+        if run:
+            literals.append(run)
+        info["literals"] = tuple(literals)
+    except Exception:
+        pass
+    return info
+
+def _build_regex_matcher(pattern: re.Pattern, info: dict):
+    exact = info["exact"]
+    prefixes = info["prefixes"]
+    suffixes = info["suffixes"]
+    literals = info["literals"]
+    run = pattern.match if info["anchored"] else pattern.search
+
+    def matches(fname: str) -> bool:
+        if fname.endswith("\n"):
+            return run(fname) is not None
+        if fname.isascii():
+            name = fname.lower()
+        elif FOLDS_TO_ASCII.isdisjoint(fname):
+            name = fname.translate(ASCII_LOWER)
+        else:
+            return run(fname) is not None
+
+        if exact is not None:
+            return name in exact
+        if prefixes and not name.startswith(prefixes):
+            return False
+        if suffixes and not name.endswith(suffixes):
+            return False
+        for lit in literals:
+            if lit not in name:
+                return False
+        return run(fname) is not None
+
+    return matches
+
+def _compile_name_filter(
+    keyword: str, use_regex: bool, extensions: list[str],
+    timing: dict, out_queue: queue.Queue,
+):
+    regex_matches = None
+    if use_regex and keyword:
+        pattern = re.compile(keyword, re.IGNORECASE)
+        regex_matches = _build_regex_matcher(pattern, _analyze_regex(keyword))
+    keyword_l = keyword.lower()
+
+    def name_ok(fname: str) -> bool:
+        if extensions:
+            _, ext = os.path.splitext(fname)
+            if ext.lower() not in extensions:
+                return False
+
+        if keyword:
+            if regex_matches:
+                t0 = time.perf_counter()
+                matched = regex_matches(fname)
+                elapsed = time.perf_counter() - t0
+                timing["regex"] += elapsed
+                timing["names"] += 1
+                timing["slowest"] = max(timing["slowest"], elapsed)
+                # judge the per-name cost, not the running total, so a long
+                # scan with a well-behaved pattern can never trip the limit
+                if elapsed > REGEX_MATCH_LIMIT_SEC or (
+                    timing["names"] >= REGEX_AVG_MIN_NAMES
+                    and timing["regex"] > timing["names"] * REGEX_AVG_LIMIT_SEC
+                ):
+                    timing["exceeded"] = True
+                if elapsed > REGEX_SLOW_MATCH_SEC and not timing["warned"]:
+                    timing["warned"] = True
+                    out_queue.put((
+                        "__WARN__",
+                        f"⚠ 正規表現が遅い: {fname} に {elapsed:.2f} 秒",
+                    ))
+                return matched
+            return keyword_l in fname.lower()
+        return True
+
+    return name_ok
+
+ARCHIVE_SUFFIXES = (
+    ".zip", ".tar", ".tar.gz", ".tgz", ".tar.bz2", ".tbz2", ".tar.xz", ".txz",
+)
+MAX_ARCHIVE_CACHE = 256
+MAX_DIR_INDEX = 100_000
+DIR_INDEX_SETTLE_SEC = 2.0
+
+WALK_STRATEGIES = {
+    "標準": "dfs",
+    "幅優先": "bfs",
+    "浅い階層優先": "shallow",
+    "最近更新されたフォルダ優先": "recent",
+}
+SHALLOW_DEPTH_BUDGET = 2
+
+def _frontier_key(
+    strategy: str, depth: int, parent_rank: int, seq: int, mtime: float,
+) -> tuple:
+    if strategy == "bfs":
+        return (depth, seq)
+    if strategy == "shallow":
+        if depth <= SHALLOW_DEPTH_BUDGET:
+            return (0, depth, seq)
+        return (1, -parent_rank, seq)
+    if strategy == "recent":
+        return (-mtime, seq)
+    return (-parent_rank, seq)
+
+def _zip_member_name(info: zipfile.ZipInfo) -> str:
+    if info.flag_bits & 0x800:
+        return info.filename
+    try:
+        return info.filename.encode("cp437").decode("cp932")
+    except (UnicodeEncodeError, UnicodeDecodeError):
+        return info.filename
+
+def _read_archive_members(
+    path: str, cancelled=None,
+) -> list[tuple[str, int, float]] | None:
+    members: list[tuple[str, int, float]] = []
+    try:
+        if path.lower().endswith(".zip"):
+            with zipfile.ZipFile(path) as zf:
+                for info in zf.infolist():
+                    if cancelled is not None and cancelled():
+                        return None
+                    if info.is_dir():
+                        continue
+                    try:
+                        mtime = datetime.datetime(*info.date_time).timestamp()
+                    except (ValueError, OverflowError):
+                        mtime = 0.0
+                    members.append(
+                        (_zip_member_name(info), info.file_size, mtime)
+                    )
+        else:
+            mode = "r:" if path.lower().endswith(".tar") else "r|*"
+            with tarfile.open(path, mode=mode) as tf:
+                for info in tf:
+                    if cancelled is not None and cancelled():
+                        return None
+                    if info.isfile():
+                        members.append((info.name, info.size, float(info.mtime)))
+    except Exception:
+        pass
+    return members
+
+def _format_size(n: int) -> str:
+    if n < 1024:
+        return f"{n} B"
+    elif n < 1024**2:
+        return f"{n/1024:.1f} KB"
+    elif n < 1024**3:
+        return f"{n/1024**2:.1f} MB"
+    else:
+        return f"{n/1024**3:.2f} GB"
+
+class SearchEngine:
+    def __init__(self, use_index: bool = False):
+        self._lock = threading.Lock()
+        self._archive_cache: dict[str, tuple[float, int, list]] = {}
+        self._use_index = use_index
+        self._dir_index: dict[tuple[str, bool], tuple] = {}
+
+    def walk(
+        self, root: str, cancel_event: threading.Event, follow_links: bool,
+        same_fs: bool, skip_pseudo: bool, stats: dict[str, int],
+        strategy: str = "dfs", min_mtime: float | None = None,
+        peer: tuple[int, frozenset[int]] | None = None,
+    ):
+        pseudo = _pseudo_devices() if skip_pseudo else set()
+        try:
+            root_dev = os.stat(root).st_dev
+        except OSError:
+            return
+        visited: set[tuple[int, int]] = set()
+        need_mtime = strategy == "recent" or min_mtime is not None
+        seq = 0
+        rank = 0
+        frontier = [((False,) + _frontier_key(strategy, 0, rank, seq, 0.0), root, 0)]
+
+        while frontier:
+            if cancel_event.is_set():
+                return
+            _key, dirpath, depth = heapq.heappop(frontier)
+            rank += 1
+
+            try:
+                st = os.stat(dirpath)
+            except OSError:
+                continue
+            if st.st_dev in pseudo and st.st_dev != root_dev:
+                stats["pseudo_skipped"] += 1
+                continue
+            if peer is not None and not _peer_may(st, peer, 0o5):
+                continue
+            if same_fs and st.st_dev != root_dev:
+                stats["other_fs_skipped"] += 1
+                continue
+            if st.st_ino:
+                key = (st.st_dev, st.st_ino)
+                if key in visited:
+                    stats["dup_dirs"] += 1
+                    continue
+                visited.add(key)
+
+            listing = self._list_dir(dirpath, st, follow_links, need_mtime)
+            if listing is None:
+                continue
+            dirs, files, dir_mtimes = listing
+
+            yield dirpath, dirs, files
+            for name, mtime in zip(dirs, dir_mtimes):
+                seq += 1
+                stale = min_mtime is not None and mtime < min_mtime
+                if stale:
+                    stats["stale_dirs"] += 1
+                heapq.heappush(frontier, (
+                    (stale,) + _frontier_key(strategy, depth + 1, rank, seq, mtime),
+                    os.path.join(dirpath, name), depth + 1,
+                ))
+
+    def _list_dir(
+        self, dirpath: str, st: os.stat_result, follow_links: bool,
+        need_mtime: bool,
+    ) -> tuple[list[str], list[str], list[float]] | None:
+        key = (dirpath, follow_links)
+        stamp = (st.st_mtime_ns, st.st_ctime_ns)
+        cached = self._dir_index.get(key) if self._use_index else None
+        if cached and cached[0] == stamp:
+            dirs, files = cached[1], cached[2]
+            if not need_mtime:
+                return dirs, files, [0.0] * len(dirs)
+            # the parent's stamp says nothing about the subdirs' own mtimes
+            dir_mtimes = []
+            for name in dirs:
+                try:
+                    dir_mtimes.append(os.stat(
+                        os.path.join(dirpath, name), follow_symlinks=follow_links,
+                    ).st_mtime)
+                except OSError:
+                    dir_mtimes.append(0.0)
+            return dirs, files, dir_mtimes
+
+        dirs = []
+        files = []
+        dir_mtimes = []
+        try:
+            with os.scandir(dirpath) as it:
+                for entry in it:
+                    try:
+                        if entry.is_dir(follow_symlinks=follow_links):
+                            if need_mtime:
+                                dir_mtimes.append(
+                                    entry.stat(follow_symlinks=follow_links).st_mtime
+                                )
+                            dirs.append(entry.name)
+                        elif entry.is_file():
+                            files.append(entry.name)
+                    except OSError:
+                        continue
+        except OSError:
+            return None
+
+        if self._use_index and time.time() - st.st_mtime > DIR_INDEX_SETTLE_SEC:
+            with self._lock:
+                self._dir_index.pop(key, None)
+                self._dir_index[key] = (stamp, dirs, files)
+                while len(self._dir_index) > MAX_DIR_INDEX:
+                    del self._dir_index[next(iter(self._dir_index))]
+        return dirs, files, dir_mtimes if need_mtime else [0.0] * len(dirs)
+
+    def archive_members(
+        self, path: str, cancelled=None,
+    ) -> list[tuple[str, int, float]] | None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return []
+        cached = self._archive_cache.get(path)
+        if cached and cached[0] == st.st_mtime and cached[1] == st.st_size:
+            return cached[2]
+
+        members = _read_archive_members(path, cancelled)
+        if members is None:
+            return None
+        with self._lock:
+            self._archive_cache.pop(path, None)
+            self._archive_cache[path] = (st.st_mtime, st.st_size, members)
+            while len(self._archive_cache) > MAX_ARCHIVE_CACHE:
+                del self._archive_cache[next(iter(self._archive_cache))]
+        return members
+
+    @staticmethod
+    def stat_size_mtime(path: str) -> tuple[int, float] | None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return None
+        return st.st_size, st.st_mtime
+
+    def search(
+        self, folder: str, recurse: bool, subscribers: list[dict],
+        cancel_event: threading.Event, follow_links: bool = False, same_fs: bool = False,
+        skip_pseudo: bool = True, search_archives: bool = False,
+        strategy: str = "dfs", peer: tuple[int, frozenset[int]] | None = None,
+    ):
+        started = time.perf_counter()
+        if peer is not None:
+            # another user's request: symlinks could lead past directories
+            # that user cannot enter, so only real children are walked
+            follow_links = False
+        live = []
+        for sub in subscribers:
+            sub["timing"] = {
+                "regex": 0.0, "names": 0, "slowest": 0.0,
+                "exceeded": False, "warned": False,
+            }
+            sub["first_result_ms"] = None
+            try:
+                sub["name_ok"] = _compile_name_filter(
+                    sub["keyword"], sub["use_regex"], sub["extensions"],
+                    sub["timing"], sub["queue"],
+                )
+            except re.error as e:
+                sub["queue"].put(("__ABORTED__", f"無効な正規表現です:\n{e}"))
+                continue
+            live.append(sub)
+        if not live:
+            return
+        cutoffs = [sub["min_mtime"] for sub in live]
+        stale_before = None if not cutoffs or None in cutoffs else min(cutoffs)
+
+        stats = {
+            "dup_dirs": 0, "other_fs_skipped": 0, "pseudo_skipped": 0,
+            "stale_dirs": 0,
+        }
+
+        def still_subscribed() -> bool:
+            for sub in live[:]:
+                if sub["cancel"].is_set():
+                    sub["queue"].put(("__CANCELLED__",))
+                    live.remove(sub)
+            if not live:
+                cancel_event.set()
+            return bool(live)
+
+        def all_cancelled() -> bool:
+            return cancel_event.is_set() or all(sub["cancel"].is_set() for sub in live)
+
+        def fan_out(fname: str, name_col: str, folder_col: str, get_info):
+            info = None
+            for sub in live[:]:
+                matched = sub["name_ok"](fname)
+                if sub["timing"]["exceeded"]:
+                    sub["queue"].put((
+                        "__ABORTED__",
+                        "正規表現の照合が極端に遅いため、検索を中断しました。\n"
+                        f"（最も遅い照合: {sub['timing']['slowest']:.2f} 秒／件）",
+                    ))
+                    live.remove(sub)
+                    continue
+                if not matched:
+                    continue
+
+                if info is None:
+                    info = get_info()
+                    if info is None:
+                        return
+                    size, mtime_ts = info
+                    size_text = _format_size(size)
+                    mtime = datetime.datetime.fromtimestamp(
+                        mtime_ts
+                    ).strftime("%Y-%m-%d %H:%M:%S")
+
+                if sub["min_mtime"] is not None and mtime_ts < sub["min_mtime"]:
+                    continue
+                if sub["first_result_ms"] is None:
+                    sub["first_result_ms"] = (time.perf_counter() - started) * 1000
+                sub["queue"].put((name_col, folder_col, size_text, mtime, size))
+
+        try:
+            if peer is not None and not _peer_can_list(folder, peer):
+                walker = []
+            elif recurse:
+                walker = self.walk(
+                    folder, cancel_event, follow_links, same_fs, skip_pseudo,
+                    stats, strategy, stale_before, peer,
+                )
+            else:
+                try:
+                    entries = os.listdir(folder)
+                except PermissionError:
+                    entries = []
+                files = [e for e in entries if os.path.isfile(os.path.join(folder, e))]
+                walker = [(folder, [], files)]
+
+            for dirpath, _dirs, filenames in walker:
+                if not still_subscribed():
+                    return
+
+                for fname in filenames:
+                    if not still_subscribed():
+                        return
+
+                    full_path = os.path.join(dirpath, fname)
+
+                    if search_archives and fname.lower().endswith(ARCHIVE_SUFFIXES):
+                        if peer is not None and not _peer_may_read(full_path, peer):
+                            members = []
+                        else:
+                            members = self.archive_members(full_path, all_cancelled)
+                        if members is None:
+                            continue
+                        for member, msize, mmtime in members:
+                            fan_out(
+                                member.rsplit("/", 1)[-1], member, full_path,
+                                lambda: (msize, mmtime),
+                            )
+
+                    fan_out(
+                        fname, fname, dirpath,
+                        lambda: self.stat_size_mtime(full_path),
+                    )
+        except PermissionError:
+            pass
+
+        if not still_subscribed():
+            return
+        for sub in live:
+            sub["queue"].put((
+                "__DONE__", dict(stats, first_result_ms=sub["first_result_ms"]),
+            ))
+
+DAEMON_UID = os.getuid() if hasattr(os, "getuid") else None
+DAEMON_SOCKET = os.environ.get(
+    "FILE_SEARCHER_SOCKET",
+    os.path.join(
+        os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir(),
+        f"file_searcher-{DAEMON_UID}.sock",
+    ),
+)
+DAEMON_SOCKET_MODE = 0o600
+DAEMON_SHARED_SOCKET_MODE = 0o660
+DAEMON_PAGE_SIZE = 500
+DAEMON_FLUSH_SEC = 0.1
+DAEMON_OPTIONS = (
+    "follow_links", "same_fs", "skip_pseudo", "search_archives", "strategy",
+)
+SEARCH_MESSAGES = ("__DONE__", "__CANCELLED__", "__ABORTED__", "__WARN__")
+HAS_UNIX_SOCKETS = hasattr(socketserver, "ThreadingUnixStreamServer")
+
+def _socket_trusted(socket_path: str) -> bool:
+    # sockets in a shared temp dir may have been planted by another user
+    try:
+        st = os.lstat(socket_path)
+    except OSError:
+        return False
+    if not stat.S_ISSOCK(st.st_mode):
+        return False
+    if st.st_uid in (DAEMON_UID, 0):
+        return True
+    # a shared daemon's socket: owned by one of our groups, closed to others
+    groups = set(os.getgroups()) | {os.getgid()}
+    return st.st_gid in groups and not st.st_mode & 0o007
+
+def _peer_identity(sock: socket.socket) -> tuple[int, frozenset[int]] | None:
+    if not hasattr(socket, "SO_PEERCRED"):
+        return None
+    try:
+        creds = sock.getsockopt(
+            socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"),
+        )
+    except OSError:
+        return None
+    pid, uid, gid = struct.unpack("3i", creds)
+    groups = {gid}
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="ascii", errors="replace") as f:
+            for line in f:
+                if line.startswith("Groups:"):
+                    groups.update(int(g) for g in line.split()[1:])
+                    break
+    except (OSError, ValueError):
+        pass
+    return uid, frozenset(groups)
+
+def _peer_may(st: os.stat_result, peer: tuple[int, frozenset[int]], want: int) -> bool:
+    # plain mode-bit check on behalf of a shared-daemon client (ACLs are not consulted)
+    uid, groups = peer
+    if uid == 0:
+        return True
+    if st.st_uid == uid:
+        bits = st.st_mode >> 6
+    elif st.st_gid in groups:
+        bits = st.st_mode >> 3
+    else:
+        bits = st.st_mode
+    return bits & want == want
+
+def _peer_may_read(path: str, peer: tuple[int, frozenset[int]]) -> bool:
+    try:
+        return _peer_may(os.stat(path), peer, 0o4)
+    except OSError:
+        return False
+
+def _peer_can_list(path: str, peer: tuple[int, frozenset[int]]) -> bool:
+    # the folder itself must be listable and every ancestor searchable
+    path = os.path.realpath(path)
+    want = 0o5
+    while True:
+        try:
+            if not _peer_may(os.stat(path), peer, want):
+                return False
+        except OSError:
+            return False
+        up = os.path.dirname(path)
+        if up == path:
+            return True
+        path, want = up, 0o1
+
+def _daemon_available(socket_path: str) -> bool:
+    if not HAS_UNIX_SOCKETS or not _socket_trusted(socket_path):
+        return False
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(0.5)
+            sock.connect(socket_path)
+            sock.sendall(b'{"op": "ping"}\n')
+            return sock.recv(64).startswith(b'{"type": "pong"')
+    except OSError:
+        return False
+
+class _PageSink:
+    def __init__(self, send, query_id: int, page_size: int):
+        self._send = send
+        self._query_id = query_id
+        self._page_size = page_size
+        self._rows: list[tuple] = []
+        self._lock = threading.Lock()
+
+    def put(self, item: tuple):
+        # rows are taken and written under one lock so a final message can
+        # never overtake the last page on the wire
+        with self._lock:
+            if item[0] in SEARCH_MESSAGES:
+                self._send_rows()
+                self._send({"type": "msg", "query": self._query_id, "item": list(item)})
+                return
+            self._rows.append(item)
+            if len(self._rows) >= self._page_size:
+                self._send_rows()
+
+    def flush(self):
+        with self._lock:
+            self._send_rows()
+
+    def _send_rows(self):
+        if self._rows:
+            rows, self._rows = self._rows, []
+            self._send({"type": "page", "query": self._query_id, "rows": rows})
+
+class _DaemonHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        # folders are listed with the daemon's permissions: other users are
+        # only served in shared mode, with results limited to what they can list
+        peer = _peer_identity(self.connection)
+        if peer is not None and peer[0] in (DAEMON_UID, 0):
+            peer = None
+        if peer is not None:
+            shared_gid = self.server.shared_gid
+            if shared_gid is None or shared_gid not in peer[1]:
+                return
+        try:
+            request = json.loads(self.rfile.readline())
+        except (ValueError, OSError):
+            return
+        if request.get("op") == "ping":
+            self.wfile.write(b'{"type": "pong"}\n')
+            return
+        if request.get("op") != "search":
+            return
+
+        cancel_event = threading.Event()
+        write_lock = threading.Lock()
+        subscribers: list[dict] = []
+
+        def send(obj: dict):
+            data = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+            with write_lock:
+                try:
+                    self.wfile.write(data)
+                    self.wfile.flush()
+                except OSError:
+                    for sub in subscribers:
+                        sub["cancel"].set()
+
+        page_size = int(request.get("page_size", DAEMON_PAGE_SIZE))
+        for i, q in enumerate(request.get("queries", [])):
+            subscribers.append({
+                "keyword": str(q.get("keyword", "")),
+                "use_regex": bool(q.get("use_regex")),
+                "extensions": [str(e) for e in q.get("extensions", [])],
+                "min_mtime": q.get("min_mtime"),
+                "queue": _PageSink(send, i, page_size),
+                "cancel": threading.Event(),
+            })
+        options = request.get("options", {})
+        options = {k: options[k] for k in DAEMON_OPTIONS if k in options}
+        options["peer"] = peer
+
+        done = threading.Event()
+        threading.Thread(
+            target=self._read_cancels, args=(subscribers,), daemon=True,
+        ).start()
+        threading.Thread(
+            target=self._flush_pages, args=(subscribers, done), daemon=True,
+        ).start()
+        try:
+            self.server.engine.search(
+                str(request.get("folder", "")), bool(request.get("recurse", True)),
+                subscribers, cancel_event, **options,
+            )
+        finally:
+            done.set()
+            for sub in subscribers:
+                sub["queue"].flush()
+
+    def _read_cancels(self, subscribers: list[dict]):
+        try:
+            for line in self.rfile:
+                try:
+                    op = json.loads(line)
+                    if op.get("op") == "cancel":
+                        subscribers[int(op["query"])]["cancel"].set()
+                except (ValueError, KeyError, IndexError, TypeError):
+                    continue
+        except (OSError, ValueError):
+            pass
+        for sub in subscribers:
+            sub["cancel"].set()
+
+    @staticmethod
+    def _flush_pages(subscribers: list[dict], done: threading.Event):
+        while not done.wait(DAEMON_FLUSH_SEC):
+            for sub in subscribers:
+                sub["queue"].flush()
+
+def run_daemon(socket_path: str = DAEMON_SOCKET, shared_group: str | None = None):
+    if not HAS_UNIX_SOCKETS:
+        print("この環境は Unix ドメインソケットに対応していません。")
+        return
+    if shared_group and not hasattr(socket, "SO_PEERCRED"):
+        print("共有モードには接続元ユーザーの確認 (SO_PEERCRED) が必要です。")
+        return
+    try:
+        st = os.lstat(socket_path)
+    except OSError:
+        st = None
+    if st is not None:
+        if not stat.S_ISSOCK(st.st_mode) or st.st_uid != DAEMON_UID:
+            print(f"ソケット以外または他のユーザーのファイルが存在します: {socket_path}")
+            return
+        if _daemon_available(socket_path):
+            print(f"デーモンは既に起動しています: {socket_path}")
+            return
+        os.remove(socket_path)
+
+    server = socketserver.ThreadingUnixStreamServer(socket_path, _DaemonHandler)
+    server.daemon_threads = True
+    server.engine = SearchEngine(use_index=True)
+    server.shared_gid = None
+    os.chmod(socket_path, DAEMON_SOCKET_MODE)
+    if shared_group:
+        try:
+            shutil.chown(socket_path, group=shared_group)
+        except (LookupError, OSError) as e:
+            print(f"ソケットのグループを {shared_group} に変更できません: {e}")
+            server.server_close()
+            os.remove(socket_path)
+            return
+        os.chmod(socket_path, DAEMON_SHARED_SOCKET_MODE)
+        server.shared_gid = os.stat(socket_path).st_gid
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    print(f"検索デーモンを起動しました: {socket_path}")
+    try:
+        server.serve_forever()
+    except (KeyboardInterrupt, SystemExit):
+        pass
+    finally:
+        server.server_close()
+        try:
+            os.remove(socket_path)
+        except OSError:
+            pass
+
+class ResultTab:
+    COL_HEADINGS = {
+        "name": "📄 ファイル名",
+        "folder": "📁 フォルダ",
+        "size": "💾 サイズ",
+        "modified": "🕐 更新日時",
+    }
+    COL_WIDTHS = {"name": 230, "folder": 350, "size": 100, "modified": 170}
+
+    def __init__(self, app: "FileSearchApp", notebook: ttk.Notebook, query: dict):
+        self.app = app
+        self.query = query
+        self.queue: queue.Queue = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.searching = False
+        self.status = ("", "App.TLabel")
+        self.warning = ""
+        self.row_count = 0
+        self.results: list[tuple] = []
+        self.groups: dict[str, dict] = {}
+        self.group_iids: dict[str, str] = {}
+        self.dirty_groups: set[str] = set()
+        self.sort_reverse: dict[str, bool] = {}
+
+        self.frame = ttk.Frame(notebook, style="App.TFrame")
+        columns = app.COLUMNS
+        self.tree = ttk.Treeview(
+            self.frame, columns=columns,
+            show="tree headings" if app.group_var.get() else "headings",
+            selectmode="browse", style="App.Treeview",
+        )
+        for col in columns:
+            self.tree.heading(
+                col, text=self.COL_HEADINGS[col],
+                command=lambda c=col: self.sort_by_column(c),
+            )
+            anchor = "e" if col == "size" else "w"
+            self.tree.column(col, width=self.COL_WIDTHS[col], anchor=anchor)
+        self.tree.column("#0", width=36, stretch=False)
+        self.apply_tags()
+
+        vsb = ttk.Scrollbar(self.frame, orient="vertical", command=self.tree.yview)
+        hsb = ttk.Scrollbar(self.frame, orient="horizontal", command=self.tree.xview)
+        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
+
+        self.tree.grid(row=0, column=0, sticky="nsew")
+        vsb.grid(row=0, column=1, sticky="ns")
+        hsb.grid(row=1, column=0, sticky="ew")
+        self.frame.columnconfigure(0, weight=1)
+        self.frame.rowconfigure(0, weight=1)
+
+        self.tree.bind("<Double-1>", app._open_selected_file)
+        self.tree.bind("<Button-3>", app._show_context_menu)
+        self.tree.bind("<<TreeviewOpen>>", self.on_group_open)
+
+        notebook.add(self.frame, text=self.title())
+
+    def title(self) -> str:
+        label = self.query.get("keyword") or self.query.get("ext_text")
+        if not label:
+            return "🆕 新しい検索"
+        if len(label) > 20:
+            label = label[:19] + "…"
+        return f"🔎 {label}"
+
+    def apply_tags(self):
+        C = self.app.C
+        self.tree.tag_configure("odd", background=C["ROW_ODD"])
+        self.tree.tag_configure("even", background=C["ROW_EVEN"])
+        self.tree.tag_configure(
+            "group", background=C["HEADER_BG"],
+            font=(self.app.FONT_FAMILY, 9, "bold"),
+        )
+
+    def add_result(self, item: tuple):
+        self.results.append(item)
+        folder = item[1]
+        group = self.groups.get(folder)
+        if group is None:
+            group = {
+                "rows": [], "size": 0, "latest": "",
+                "iid": None, "loaded": False, "loaded_rows": 0,
+            }
+            self.groups[folder] = group
+        group["rows"].append(item)
+        group["size"] += item[4]
+        group["latest"] = max(group["latest"], item[3])
+
+        if not self.app.group_var.get():
+            tag = "even" if self.row_count % 2 == 0 else "odd"
+            self.tree.insert("", END, values=item[:4], tags=(tag,))
+            self.row_count += 1
+        elif group["iid"] is None:
+            self.insert_group_node(folder, group)
+        else:
+            if group["loaded"]:
+                self.insert_group_row(group, item)
+            self.dirty_groups.add(folder)
+
+    def group_values(self, folder: str, group: dict) -> tuple:
+        return (
+            f"📁 {len(group['rows'])} 件", folder,
+            _format_size(group["size"]), group["latest"],
+        )
+
+    def insert_group_node(self, folder: str, group: dict):
+        iid = self.tree.insert(
+            "", END, values=self.group_values(folder, group), tags=("group",),
+        )
+        self.tree.insert(iid, END)
+        group["iid"] = iid
+        group["loaded"] = False
+        group["loaded_rows"] = 0
+        self.group_iids[iid] = folder
+
+    def insert_group_row(self, group: dict, item: tuple):
+        tag = "even" if group["loaded_rows"] % 2 == 0 else "odd"
+        self.tree.insert(group["iid"], END, values=item[:4], tags=(tag,))
+        group["loaded_rows"] += 1
+
+    def on_group_open(self, _event):
+        iid = self.tree.focus()
+        folder = self.group_iids.get(iid)
+        if folder is None:
+            return
+        group = self.groups[folder]
+        if group["loaded"]:
+            return
+        self.tree.delete(*self.tree.get_children(iid))
+        group["loaded"] = True
+        for item in group["rows"]:
+            self.insert_group_row(group, item)
+
+    def refresh_group_nodes(self):
+        for folder in self.dirty_groups:
+            group = self.groups.get(folder)
+            if group and group["iid"]:
+                self.tree.item(
+                    group["iid"], values=self.group_values(folder, group)
+                )
+        self.dirty_groups.clear()
+
+    def rebuild_view(self):
+        self.tree.delete(*self.tree.get_children(""))
+        self.group_iids.clear()
+        self.dirty_groups.clear()
+        self.row_count = 0
+        for group in self.groups.values():
+            group["iid"] = None
+            group["loaded"] = False
+
+        if self.app.group_var.get():
+            self.tree.configure(show="tree headings")
+            for folder, group in self.groups.items():
+                self.insert_group_node(folder, group)
+        else:
+            self.tree.configure(show="headings")
+            for item in self.results:
+                tag = "even" if self.row_count % 2 == 0 else "odd"
+                self.tree.insert("", END, values=item[:4], tags=(tag,))
+                self.row_count += 1
+
+    def remove_result(self, name: str, folder: str):
+        group = self.groups.get(folder)
+        if group is None:
+            return
+        for item in group["rows"]:
+            if item[0] == name:
+                group["rows"].remove(item)
+                self.results.remove(item)
+                group["size"] -= item[4]
+                break
+        group["latest"] = max((r[3] for r in group["rows"]), default="")
+
+        if not group["rows"]:
+            if group["iid"]:
+                self.tree.delete(group["iid"])
+                del self.group_iids[group["iid"]]
+            del self.groups[folder]
+        elif group["iid"]:
+            if group["loaded"]:
+                group["loaded_rows"] = len(group["rows"])
+            self.tree.item(group["iid"], values=self.group_values(folder, group))
+
+    def clear(self):
+        self.tree.delete(*self.tree.get_children(""))
+        self.row_count = 0
+        self.results.clear()
+        self.groups.clear()
+        self.group_iids.clear()
+        self.dirty_groups.clear()
+        self.warning = ""
+        self.status = ("", "App.TLabel")
+
+    def sort_by_column(self, col: str):
+        reverse = self.sort_reverse.get(col, False)
+        self.sort_reverse[col] = not reverse
+
+        self.sort_children("", col, reverse)
+        idx = self.app.COLUMNS.index(col)
+        for iid, folder in self.group_iids.items():
+            self.groups[folder]["rows"].sort(
+                key=lambda r: self.sort_key(r[idx], col), reverse=reverse
+            )
+            if self.groups[folder]["loaded"]:
+                self.sort_children(iid, col, reverse)
+        self.reapply_row_tags()
+
+    def sort_children(self, parent: str, col: str, reverse: bool):
+        if parent == "" and self.group_iids and col == "name":
+            items = [(len(self.groups[self.group_iids[iid]]["rows"]), iid)
+                     for iid in self.tree.get_children("")]
+            items.sort(reverse=reverse)
+        else:
+            items = [(self.tree.set(iid, col), iid)
+                     for iid in self.tree.get_children(parent)]
+            items.sort(key=lambda x: self.sort_key(x[0], col), reverse=reverse)
+
+        for idx, (_, iid) in enumerate(items):
+            self.tree.move(iid, parent, idx)
+
+    def sort_key(self, value: str, col: str):
+        if col == "size":
+            return self.app._parse_size(value)
+        return value.lower()
+
+    def reapply_row_tags(self):
+        for idx, iid in enumerate(self.tree.get_children("")):
+            if iid in self.group_iids:
+                for cidx, child in enumerate(self.tree.get_children(iid)):
+                    self.tree.item(
+                        child, tags=("even" if cidx % 2 == 0 else "odd",)
+                    )
+            else:
+                self.tree.item(iid, tags=("even" if idx % 2 == 0 else "odd",))
+
 class FileSearchApp:
     POLL_INTERVAL_MS = 50
     FONT_FAMILY = "Meiryo UI"
+    COLUMNS = ("name", "folder", "size", "modified")
 
-    def __init__(self, root: Tk):
+    def __init__(self, root: Tk, daemon_socket: str = DAEMON_SOCKET):
         self.root = root
+        self.daemon_socket = daemon_socket
         self.root.title("📂 ファイル検索ツール")
         self.root.geometry("1020x720")
         self.root.minsize(780, 560)
@@ -87,12 +1208,19 @@ class FileSearchApp:
         self.regex_var = BooleanVar(value=False)
         self.subfolder_var = BooleanVar(value=True)
         self.date_filter_var = StringVar(value="すべて")
+        self.follow_links_var = BooleanVar(value=False)
+        self.same_fs_var = BooleanVar(value=False)
+        self.skip_pseudo_var = BooleanVar(value=True)
+        self.archive_var = BooleanVar(value=False)
+        self.group_var = BooleanVar(value=False)
+        self.strategy_var = StringVar(value="標準")
 
         self._cancel_event = threading.Event()
-        self._result_queue: queue.Queue = queue.Queue()
         self._search_thread: threading.Thread | None = None
-        self._sort_reverse: dict[str, bool] = {}
-        self._row_count = 0
+        self._tabs: list[ResultTab] = []
+        self._active_tab: ResultTab | None = None
+        self._engine = SearchEngine()
+        self._via_daemon = False
 
         self._history: list[str] = self._load_history()
 
@@ -131,6 +1259,10 @@ class FileSearchApp:
             "StatusSearch.TLabel", background=C["BG"], foreground=C["INFO"],
             font=(self.FONT_FAMILY, 10, "bold"),
         )
+        style.configure(
+            "StatusWarn.TLabel", background=C["BG"], foreground=C["WARNING"],
+            font=(self.FONT_FAMILY, 10, "bold"),
+        )
         style.configure(
             "Count.TLabel", background=C["BG"], foreground=C["TEXT_LIGHT"],
             font=(self.FONT_FAMILY, 9),
@@ -200,6 +1332,13 @@ class FileSearchApp:
         style.map("App.TCheckbutton",
                   background=[("active", C["CARD_BG"])])
 
+        style.configure(
+            "Bar.TCheckbutton", background=C["BG"],
+            foreground=C["TEXT"], font=(self.FONT_FAMILY, 9),
+        )
+        style.map("Bar.TCheckbutton",
+                  background=[("active", C["BG"])])
+
         style.configure(
             "App.Horizontal.TProgressbar",
             troughcolor=C["BORDER"], background=C["PRIMARY"],
@@ -216,6 +1355,17 @@ class FileSearchApp:
             foreground=C["TEXT"], font=(self.FONT_FAMILY, 10, "bold"),
         )
 
+        style.configure(
+            "App.TNotebook", background=C["BG"], borderwidth=0,
+        )
+        style.configure(
+            "App.TNotebook.Tab", background=C["HEADER_BG"],
+            foreground=C["TEXT"], font=(self.FONT_FAMILY, 9),
+            padding=(12, 4), borderwidth=0,
+        )
+        style.map("App.TNotebook.Tab",
+                  background=[("selected", C["CARD_BG"])])
+
         style.configure(
             "App.Treeview", background=C["CARD_BG"],
             foreground=C["TEXT"], fieldbackground=C["CARD_BG"],
@@ -239,9 +1389,9 @@ class FileSearchApp:
         self.root.configure(bg=C["BG"])
         self._set_widget_bg(self.root, C)
 
-        self.tree.tag_configure("odd", background=C["ROW_ODD"])
-        self.tree.tag_configure("even", background=C["ROW_EVEN"])
-        self._reapply_row_tags()
+        for tab in self._tabs:
+            tab.apply_tags()
+            tab.reapply_row_tags()
 
         if C["name"] == "dark":
             self.btn_theme.config(text="☀️ ライト")
@@ -356,6 +1506,49 @@ class FileSearchApp:
             variable=self.regex_var, style="App.TCheckbutton",
         ).pack(side="left")
 
+        r5 = ttk.Frame(cond, style="Card.TFrame")
+        r5.pack(fill="x", pady=(6, 2))
+
+        ttk.Label(r5, text="🧭 走査", style="Card.TLabel").pack(
+            side="left", padx=(0, 4)
+        )
+        ttk.Checkbutton(
+            r5, text="🔗 シンボリックリンクをたどる",
+            variable=self.follow_links_var, style="App.TCheckbutton",
+        ).pack(side="left", padx=(0, 16))
+
+        ttk.Checkbutton(
+            r5, text="💽 同じドライブ内のみ",
+            variable=self.same_fs_var, style="App.TCheckbutton",
+        ).pack(side="left", padx=(0, 16))
+
+        ttk.Checkbutton(
+            r5, text="🚫 /proc などを除外",
+            variable=self.skip_pseudo_var, style="App.TCheckbutton",
+        ).pack(side="left", padx=(0, 16))
+
+        ttk.Checkbutton(
+            r5, text="📦 圧縮ファイルの中も検索",
+            variable=self.archive_var, style="App.TCheckbutton",
+        ).pack(side="left")
+
+        r6 = ttk.Frame(cond, style="Card.TFrame")
+        r6.pack(fill="x", pady=(6, 2))
+
+        ttk.Label(r6, text="🗂 走査順", style="Card.TLabel").pack(
+            side="left", padx=(0, 4)
+        )
+        self.combo_strategy = ttk.Combobox(
+            r6, textvariable=self.strategy_var,
+            values=list(WALK_STRATEGIES),
+            state="readonly", style="App.TCombobox", width=26,
+        )
+        self.combo_strategy.pack(side="left", padx=(0, 8))
+        ttk.Label(
+            r6, text="更新日フィルタ中は古いフォルダを後回しにします",
+            style="Sub.TLabel",
+        ).pack(side="left")
+
         ab = ttk.Frame(self.root, style="App.TFrame")
         ab.pack(fill="x", padx=px, pady=6)
 
@@ -388,52 +1581,31 @@ class FileSearchApp:
         ).pack(side="left")
         self.count_label = ttk.Label(th, text="0 件", style="Count.TLabel")
         self.count_label.pack(side="left", padx=(8, 0))
+        ttk.Button(
+            th, text="✖ タブを閉じる", style="Browse.TButton",
+            command=self._close_tab,
+        ).pack(side="right")
+        ttk.Button(
+            th, text="➕ 新しいタブ", style="Browse.TButton",
+            command=self._add_tab,
+        ).pack(side="right", padx=(0, 8))
+        ttk.Checkbutton(
+            th, text="📁 フォルダ別に表示",
+            variable=self.group_var, style="Bar.TCheckbutton",
+            command=self._rebuild_results_views,
+        ).pack(side="right", padx=(0, 12))
 
-        columns = ("name", "folder", "size", "modified")
-        col_headings = {
-            "name": "📄 ファイル名",
-            "folder": "📁 フォルダ",
-            "size": "💾 サイズ",
-            "modified": "🕐 更新日時",
-        }
-        col_widths = {"name": 230, "folder": 350, "size": 100, "modified": 170}
-
-        tf = ttk.Frame(self.root, style="App.TFrame")
-        tf.pack(fill="both", expand=True, padx=px, pady=(0, 8))
-
-        self.tree = ttk.Treeview(
-            tf, columns=columns, show="headings",
-            selectmode="browse", style="App.Treeview",
-        )
-        for col in columns:
-            self.tree.heading(
-                col, text=col_headings[col],
-                command=lambda c=col: self._sort_by_column(c),
-            )
-            anchor = "e" if col == "size" else "w"
-            self.tree.column(col, width=col_widths[col], anchor=anchor)
-
-        self.tree.tag_configure("odd", background=C["ROW_ODD"])
-        self.tree.tag_configure("even", background=C["ROW_EVEN"])
-
-        vsb = ttk.Scrollbar(tf, orient="vertical", command=self.tree.yview)
-        hsb = ttk.Scrollbar(tf, orient="horizontal", command=self.tree.xview)
-        self.tree.configure(yscrollcommand=vsb.set, xscrollcommand=hsb.set)
-
-        self.tree.grid(row=0, column=0, sticky="nsew")
-        vsb.grid(row=0, column=1, sticky="ns")
-        hsb.grid(row=1, column=0, sticky="ew")
-        tf.columnconfigure(0, weight=1)
-        tf.rowconfigure(0, weight=1)
-
-        self.tree.bind("<Double-1>", self._open_selected_file)
+        self.notebook = ttk.Notebook(self.root, style="App.TNotebook")
+        self.notebook.pack(fill="both", expand=True, padx=px, pady=(0, 8))
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        self._add_tab()
 
         ft = ttk.Frame(self.root, style="App.TFrame")
         ft.pack(fill="x", padx=px, pady=(0, 8))
         dnd_hint = " ｜ フォルダをドラッグ&ドロップで指定可能" if HAS_WINDND else ""
         ttk.Label(
             ft,
-            text=f"💡 ダブルクリック: 開く ｜ 右クリック: メニュー ｜ ヘッダー: ソート{dnd_hint}",
+            text=f"💡 ダブルクリック: 開く ｜ 右クリック: メニュー ｜ ヘッダー: ソート ｜ 検索すると全タブを1回の走査でまとめて検索{dnd_hint}",
             style="Count.TLabel",
         ).pack(side="left")
 
@@ -457,19 +1629,19 @@ class FileSearchApp:
             label="🗑️ ファイルを削除", command=self._ctx_delete_file
         )
 
-        self.tree.bind("<Button-3>", self._show_context_menu)
-
     def _show_context_menu(self, event):
-        iid = self.tree.identify_row(event.y)
-        if iid:
-            self.tree.selection_set(iid)
+        tab = self._current_tab()
+        iid = tab.tree.identify_row(event.y)
+        if iid and iid not in tab.group_iids:
+            tab.tree.selection_set(iid)
             self.ctx_menu.post(event.x_root, event.y_root)
 
     def _get_selected_path(self) -> str | None:
-        sel = self.tree.selection()
-        if not sel:
+        tab = self._current_tab()
+        sel = tab.tree.selection()
+        if not sel or sel[0] in tab.group_iids:
             return None
-        v = self.tree.item(sel[0], "values")
+        v = tab.tree.item(sel[0], "values")
         return os.path.join(v[1], v[0])
 
     def _ctx_open_file(self):
@@ -481,9 +1653,12 @@ class FileSearchApp:
                 messagebox.showerror("エラー", str(e))
 
     def _ctx_open_folder(self):
-        sel = self.tree.selection()
+        tree = self._current_tab().tree
+        sel = tree.selection()
         if sel:
-            folder = self.tree.item(sel[0], "values")[1]
+            folder = tree.item(sel[0], "values")[1]
+            if os.path.isfile(folder):
+                folder = os.path.dirname(folder)
             if os.path.isdir(folder):
                 os.startfile(folder)
 
@@ -494,9 +1669,10 @@ class FileSearchApp:
             self.root.clipboard_append(p)
 
     def _ctx_copy_folder_path(self):
-        sel = self.tree.selection()
+        tree = self._current_tab().tree
+        sel = tree.selection()
         if sel:
-            folder = self.tree.item(sel[0], "values")[1]
+            folder = tree.item(sel[0], "values")[1]
             self.root.clipboard_clear()
             self.root.clipboard_append(folder)
 
@@ -507,12 +1683,14 @@ class FileSearchApp:
         if messagebox.askyesno("確認", f"本当に削除しますか？\n{p}"):
             try:
                 os.remove(p)
-                sel = self.tree.selection()
+                tab = self._current_tab()
+                sel = tab.tree.selection()
                 if sel:
-                    self.tree.delete(sel[0])
-                    self._reapply_row_tags()
-                    total = len(self.tree.get_children(""))
-                    self.count_label.config(text=f"{total} 件")
+                    name, folder = tab.tree.item(sel[0], "values")[:2]
+                    tab.tree.delete(sel[0])
+                    tab.remove_result(name, folder)
+                    tab.reapply_row_tags()
+                    self.count_label.config(text=f"{len(tab.results)} 件")
             except OSError as e:
                 messagebox.showerror("エラー", str(e))
 
@@ -562,56 +1740,178 @@ class FileSearchApp:
         if path:
             self.folder_var.set(path)
 
+    def _current_tab(self) -> ResultTab | None:
+        selected = self.notebook.select()
+        for tab in self._tabs:
+            if str(tab.frame) == selected:
+                return tab
+        return None
+
+    def _query_from_fields(self) -> dict:
+        return {
+            "keyword": self.keyword_var.get().strip(),
+            "use_regex": self.regex_var.get(),
+            "ext_text": self.ext_var.get().strip(),
+            "date": self.date_filter_var.get(),
+        }
+
+    def _load_query(self, query: dict):
+        self.keyword_var.set(query["keyword"])
+        self.regex_var.set(query["use_regex"])
+        self.ext_var.set(query["ext_text"])
+        self.date_filter_var.set(query["date"])
+
+    @staticmethod
+    def _query_problem(query: dict) -> str | None:
+        if not query["keyword"] and not query["ext_text"]:
+            return "ファイル名・拡張子が未入力です"
+        if query["use_regex"] and query["keyword"]:
+            try:
+                re.compile(query["keyword"])
+            except re.error as e:
+                return f"無効な正規表現です: {e}"
+        return None
+
+    @staticmethod
+    def _parse_extensions(ext_text: str) -> list[str]:
+        return [
+            e.strip().lower() if e.strip().startswith(".")
+            else f".{e.strip().lower()}"
+            for e in ext_text.split(",") if e.strip()
+        ]
+
+    def _add_tab(self):
+        tab = ResultTab(self, self.notebook, self._query_from_fields())
+        self._tabs.append(tab)
+        self.notebook.select(tab.frame)
+
+    def _close_tab(self):
+        tab = self._current_tab()
+        if tab is None:
+            return
+        tab.cancel_event.set()
+        tab.searching = False
+        self._tabs.remove(tab)
+        self._active_tab = None
+        self.notebook.forget(tab.frame)
+        tab.frame.destroy()
+        if not self._tabs:
+            self._add_tab()
+
+    def _on_tab_changed(self, _event):
+        tab = self._current_tab()
+        if tab is None or tab is self._active_tab:
+            return
+        if self._active_tab in self._tabs:
+            self._active_tab.query = self._query_from_fields()
+        self._active_tab = tab
+        self._load_query(tab.query)
+        self._update_status()
+
+    def _rebuild_results_views(self):
+        for tab in self._tabs:
+            tab.rebuild_view()
+
     def _start_search(self):
         folder = self.folder_var.get().strip()
         if not folder or not os.path.isdir(folder):
             messagebox.showwarning("入力エラー", "有効なフォルダを指定してください。")
             return
 
-        keyword = self.keyword_var.get().strip()
+        query = self._query_from_fields()
+        keyword = query["keyword"]
 
-        if not keyword and not self.ext_var.get().strip():
+        if not keyword and not query["ext_text"]:
             messagebox.showwarning(
                 "入力エラー",
                 "ファイル名または拡張子のどちらかを入力してください。",
             )
             return
 
-        if self.regex_var.get() and keyword:
+        if query["use_regex"] and keyword:
             try:
                 re.compile(keyword)
             except re.error as e:
                 messagebox.showerror("正規表現エラー", f"無効な正規表現です:\n{e}")
                 return
 
-        ext_text = self.ext_var.get().strip()
-        extensions: list[str] = []
-        if ext_text:
-            extensions = [
-                e.strip().lower() if e.strip().startswith(".")
-                else f".{e.strip().lower()}"
-                for e in ext_text.split(",") if e.strip()
-            ]
-
-        min_mtime = self._calc_min_mtime()
+        current = self._current_tab()
+        risky = []
+        for tab in self._tabs:
+            tab_query = query if tab is current else tab.query
+            if (
+                tab_query["use_regex"]
+                and self._query_problem(tab_query) is None
+                and _analyze_regex(tab_query["keyword"])["nested_repeat"]
+            ):
+                risky.append(f"・{tab_query['keyword']}")
+        if risky and not messagebox.askyesno(
+            "正規表現の警告",
+            "次の正規表現に入れ子の繰り返し（例: (a+)+）が含まれているため、"
+            "検索が極端に遅くなる可能性があります。\n"
+            + "\n".join(risky) + "\n"
+            f"1件の照合に {REGEX_MATCH_LIMIT_SEC:.0f} 秒を超えるなど極端に遅い場合は、"
+            "その検索を中断します。\n\n"
+            "続行しますか？",
+        ):
+            return
 
+        current.query = query
         self._save_history(keyword)
 
-        self._clear_results()
+        subscribers = []
+        for tab in self._tabs:
+            problem = self._query_problem(tab.query)
+            if problem is not None:
+                tab.clear()
+                tab.searching = False
+                tab.status = (f"⚠ スキップ — {problem}", "StatusWarn.TLabel")
+                self.notebook.tab(tab.frame, text=tab.title())
+                continue
+            tab.clear()
+            tab.queue = queue.Queue()
+            tab.cancel_event = threading.Event()
+            tab.searching = True
+            tab.status = ("🔍 検索中…", "StatusSearch.TLabel")
+            self.notebook.tab(tab.frame, text=tab.title())
+            subscribers.append({
+                "keyword": tab.query["keyword"],
+                "use_regex": tab.query["use_regex"],
+                "extensions": self._parse_extensions(tab.query["ext_text"]),
+                "min_mtime": self._calc_min_mtime(tab.query["date"]),
+                "queue": tab.queue,
+                "cancel": tab.cancel_event,
+            })
+
         self._cancel_event.clear()
         self._set_searching(True)
-
+        self._update_status()
+
+        options = {
+            "follow_links": self.follow_links_var.get(),
+            "same_fs": self.same_fs_var.get(),
+            "skip_pseudo": self.skip_pseudo_var.get(),
+            "search_archives": self.archive_var.get(),
+            "strategy": WALK_STRATEGIES.get(self.strategy_var.get(), "dfs"),
+        }
+        self._via_daemon = _daemon_available(self.daemon_socket)
+        if self._via_daemon:
+            target = self._daemon_worker
+        else:
+            target = self._engine.search
         self._search_thread = threading.Thread(
-            target=self._search_worker,
-            args=(folder, keyword, self.regex_var.get(),
-                  extensions, self.subfolder_var.get(), min_mtime),
+            target=target,
+            args=(folder, self.subfolder_var.get(), subscribers, self._cancel_event),
+            kwargs=options,
             daemon=True,
         )
         self._search_thread.start()
         self._poll_results()
 
     def _cancel_search(self):
-        self._cancel_event.set()
+        tab = self._current_tab()
+        if tab is not None:
+            tab.cancel_event.set()
 
     def _open_selected_file(self, _event):
         p = self._get_selected_path()
@@ -621,8 +1921,8 @@ class FileSearchApp:
             except OSError as e:
                 messagebox.showerror("エラー", str(e))
 
-    def _calc_min_mtime(self) -> float | None:
-        choice = self.date_filter_var.get()
+    @staticmethod
+    def _calc_min_mtime(choice: str) -> float | None:
         now = datetime.datetime.now()
         if choice == "今日":
             start = now.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -635,25 +1935,9 @@ class FileSearchApp:
             return (now - datetime.timedelta(days=365)).timestamp()
         return None
 
-    def _sort_by_column(self, col: str):
-        reverse = self._sort_reverse.get(col, False)
-        self._sort_reverse[col] = not reverse
-
-        items = [(self.tree.set(iid, col), iid)
-                 for iid in self.tree.get_children("")]
-
-        if col == "size":
-            items.sort(key=lambda x: self._parse_size(x[0]), reverse=reverse)
-        else:
-            items.sort(key=lambda x: x[0].lower(), reverse=reverse)
-
-        for idx, (_, iid) in enumerate(items):
-            self.tree.move(iid, "", idx)
-        self._reapply_row_tags()
-
     @staticmethod
     def _parse_size(text: str) -> float:
-        units = {"B": 1, "KB": 1024, "MB": 1024**2, "GB": 1024**3}
+        units = {"KB": 1024, "MB": 1024**2, "GB": 1024**3, "B": 1}
         text = text.strip()
         for unit, factor in units.items():
             if text.upper().endswith(unit):
@@ -663,142 +1947,180 @@ class FileSearchApp:
                     return 0
         return 0
 
-    def _search_worker(
-        self, folder: str, keyword: str, use_regex: bool,
-        extensions: list[str], recurse: bool, min_mtime: float | None,
+    def _daemon_worker(
+        self, folder: str, recurse: bool, subscribers: list[dict],
+        cancel_event: threading.Event, **options,
     ):
-        pattern = None
-        if use_regex and keyword:
-            pattern = re.compile(keyword, re.IGNORECASE)
-
+        request = {
+            "op": "search", "folder": folder, "recurse": recurse,
+            "options": options, "page_size": DAEMON_PAGE_SIZE,
+            "queries": [
+                {k: sub[k] for k in ("keyword", "use_regex", "extensions", "min_mtime")}
+                for sub in subscribers
+            ],
+        }
         try:
-            if recurse:
-                walker = os.walk(folder)
-            else:
-                try:
-                    entries = os.listdir(folder)
-                except PermissionError:
-                    self._result_queue.put(("__DONE__",))
-                    return
-                files = [e for e in entries if os.path.isfile(os.path.join(folder, e))]
-                walker = [(folder, [], files)]
-
-            for dirpath, _dirs, filenames in walker:
-                if self._cancel_event.is_set():
-                    self._result_queue.put(("__CANCELLED__",))
-                    return
-
-                for fname in filenames:
-                    if self._cancel_event.is_set():
-                        self._result_queue.put(("__CANCELLED__",))
-                        return
-
-                    if extensions:
-                        _, ext = os.path.splitext(fname)
-                        if ext.lower() not in extensions:
-                            continue
-
-                    if keyword:
-                        if pattern:
-                            if not pattern.search(fname):
-                                continue
-                        else:
-                            if keyword.lower() not in fname.lower():
-                                continue
-
-                    full_path = os.path.join(dirpath, fname)
-                    try:
-                        stat = os.stat(full_path)
-                    except OSError:
-                        continue
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.connect(self.daemon_socket)
+            sock.sendall((json.dumps(request, ensure_ascii=False) + "\n").encode("utf-8"))
+        except OSError:
+            self._via_daemon = False
+            self._engine.search(folder, recurse, subscribers, cancel_event, **options)
+            return
 
-                    if min_mtime is not None and stat.st_mtime < min_mtime:
+        pending = set(range(len(subscribers)))
+        cancelled: set[int] = set()
+        buf = b""
+        with sock:
+            sock.settimeout(DAEMON_FLUSH_SEC)
+            while pending:
+                for i in pending - cancelled:
+                    if subscribers[i]["cancel"].is_set():
+                        cancelled.add(i)
+                        try:
+                            sock.sendall(f'{{"op": "cancel", "query": {i}}}\n'.encode())
+                        except OSError:
+                            pass
+                try:
+                    chunk = sock.recv(65536)
+                except socket.timeout:
+                    continue
+                except OSError:
+                    break
+                if not chunk:
+                    break
+                *lines, buf = (buf + chunk).split(b"\n")
+                for line in lines:
+                    msg = json.loads(line)
+                    out = subscribers[msg["query"]]["queue"]
+                    if msg["type"] == "page":
+                        for row in msg["rows"]:
+                            out.put(tuple(row))
                         continue
-
-                    size = self._format_size(stat.st_size)
-                    mtime = datetime.datetime.fromtimestamp(
-                        stat.st_mtime
-                    ).strftime("%Y-%m-%d %H:%M:%S")
-
-                    self._result_queue.put((fname, dirpath, size, mtime))
-        except PermissionError:
-            pass
-
-        self._result_queue.put(("__DONE__",))
+                    item = tuple(msg["item"])
+                    out.put(item)
+                    if item[0] != "__WARN__":
+                        pending.discard(msg["query"])
+
+        for i in pending:
+            subscribers[i]["queue"].put(
+                ("__ABORTED__", "検索デーモンとの接続が切れました。")
+            )
 
     @staticmethod
-    def _format_size(n: int) -> str:
-        if n < 1024:
-            return f"{n} B"
-        elif n < 1024**2:
-            return f"{n/1024:.1f} KB"
-        elif n < 1024**3:
-            return f"{n/1024**2:.1f} MB"
-        else:
-            return f"{n/1024**3:.2f} GB"
+    def _format_walk_stats(stats: dict[str, int]) -> str:
+        parts = []
+        if stats.get("dup_dirs"):
+            parts.append(f"重複フォルダ {stats['dup_dirs']} 件をスキップ")
+        if stats.get("other_fs_skipped"):
+            parts.append(f"別ドライブ {stats['other_fs_skipped']} 件を除外")
+        if stats.get("pseudo_skipped"):
+            parts.append(f"特殊FS {stats['pseudo_skipped']} 件を除外")
+        if stats.get("stale_dirs"):
+            parts.append(f"古いフォルダ {stats['stale_dirs']} 件を後回し")
+        if stats.get("first_result_ms") is not None:
+            parts.append(f"最初のヒットまで {stats['first_result_ms'] / 1000:.2f} 秒")
+        return f"（{' / '.join(parts)}）" if parts else ""
 
     def _poll_results(self):
+        for tab in self._tabs:
+            if tab.searching:
+                self._drain_tab(tab)
+        self._update_status()
+
+        running = self._search_thread is not None and self._search_thread.is_alive()
+        if running or any(tab.searching for tab in self._tabs):
+            self.root.after(self.POLL_INTERVAL_MS, self._poll_results)
+        else:
+            self._set_searching(False)
+
+    def _drain_tab(self, tab: ResultTab):
         while True:
             try:
-                item = self._result_queue.get_nowait()
+                item = tab.queue.get_nowait()
             except queue.Empty:
                 break
 
             if item[0] == "__DONE__":
-                self._set_searching(False)
-                total = len(self.tree.get_children(""))
-                self.status_label.config(
-                    text=f"✅ 完了 — {total} 件", style="StatusOK.TLabel",
+                tab.searching = False
+                tab.refresh_group_nodes()
+                extra = self._format_walk_stats(item[1]) if len(item) > 1 else ""
+                tab.status = (
+                    f"✅ 完了 — {len(tab.results)} 件{extra}", "StatusOK.TLabel",
                 )
-                self.count_label.config(text=f"{total} 件")
-                return
+                break
             elif item[0] == "__CANCELLED__":
-                self._set_searching(False)
-                total = len(self.tree.get_children(""))
-                self.status_label.config(
-                    text=f"⏹ キャンセル — {total} 件", style="App.TLabel",
+                tab.searching = False
+                tab.refresh_group_nodes()
+                tab.status = (
+                    f"⏹ キャンセル — {len(tab.results)} 件", "App.TLabel",
                 )
-                self.count_label.config(text=f"{total} 件")
-                return
+                break
+            elif item[0] == "__ABORTED__":
+                tab.searching = False
+                tab.refresh_group_nodes()
+                tab.status = (
+                    f"⚠ 中断 — {len(tab.results)} 件", "StatusWarn.TLabel",
+                )
+                messagebox.showwarning("検索を中断しました", item[1])
+                break
+            elif item[0] == "__WARN__":
+                tab.warning = item[1]
             else:
-                tag = "even" if self._row_count % 2 == 0 else "odd"
-                self.tree.insert("", END, values=item, tags=(tag,))
-                self._row_count += 1
-
-        total = len(self.tree.get_children(""))
-        self.status_label.config(
-            text=f"🔍 検索中… {total} 件", style="StatusSearch.TLabel",
-        )
-        self.count_label.config(text=f"{total} 件")
-        self.root.after(self.POLL_INTERVAL_MS, self._poll_results)
+                tab.add_result(item)
+
+        total = len(tab.results)
+        if tab.searching:
+            tab.refresh_group_nodes()
+            if tab.warning:
+                tab.status = (
+                    f"🔍 検索中… {total} 件 ｜ {tab.warning}", "StatusWarn.TLabel",
+                )
+            else:
+                via = " ｜ 🛰 共有デーモン" if self._via_daemon else ""
+                tab.status = (f"🔍 検索中… {total} 件{via}", "StatusSearch.TLabel")
+        self.notebook.tab(tab.frame, text=f"{tab.title()} ({total})")
 
-    def _clear_results(self):
-        for iid in self.tree.get_children(""):
-            self.tree.delete(iid)
-        self._row_count = 0
-        self.count_label.config(text="0 件")
-        self.status_label.config(text="", style="App.TLabel")
+    def _update_status(self):
+        tab = self._current_tab()
+        if tab is None:
+            return
+        text, style = tab.status
+        self.status_label.config(text=text, style=style)
+        self.count_label.config(text=f"{len(tab.results)} 件")
+        self.btn_cancel.config(state="normal" if tab.searching else "disabled")
 
     def _set_searching(self, active: bool):
         if active:
             self.btn_search.config(state="disabled")
-            self.btn_cancel.config(state="normal")
             self.progress.start(10)
-            self.status_label.config(
-                text="🔍 検索中…", style="StatusSearch.TLabel",
-            )
         else:
             self.btn_search.config(state="normal")
             self.btn_cancel.config(state="disabled")
             self.progress.stop()
 
-    def _reapply_row_tags(self):
-        for idx, iid in enumerate(self.tree.get_children("")):
-            self.tree.item(iid, tags=("even" if idx % 2 == 0 else "odd",))
-
 def main():
+    parser = argparse.ArgumentParser(description="ファイル検索ツール")
+    parser.add_argument(
+        "--daemon", action="store_true",
+        help="走査・インデックス・キャッシュを共有する検索デーモンとして起動する",
+    )
+    parser.add_argument(
+        "--socket", default=DAEMON_SOCKET,
+        help=f"デーモンの Unix ドメインソケット (既定: {DAEMON_SOCKET})",
+    )
+    parser.add_argument(
+        "--shared-group", metavar="GROUP",
+        help="デーモンをこのグループのメンバーにも開放する (各自が一覧できるフォルダのみ検索)",
+    )
+    args = parser.parse_args()
+
+    if args.daemon:
+        run_daemon(args.socket, args.shared_group)
+        return
+
     root = Tk()
-    FileSearchApp(root)
+    FileSearchApp(root, daemon_socket=args.socket)
     root.mainloop()
 
 if __name__ == "__main__":